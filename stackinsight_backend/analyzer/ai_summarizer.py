@@ -1,8 +1,33 @@
 import os
 import json
-import google.generativeai as genai
+import time
+import uuid
+
+from analyzer.checkpoint import clear_checkpoint, content_hash, load_checkpoint, prune_checkpoints, record_file
+from analyzer.code_parser import get_language
+from analyzer.search_index import build_search_index, save_search_index
+from analyzer.symbol_store import get_symbol_summary, save_symbol_context
 
 CACHE_PATH = "summary_cache.json"
+SUMMARY_UNAVAILABLE = "Summary unavailable."
+
+# google.generativeai pulls in gRPC and protobuf, so it is imported on the
+# first LLM call instead of at module load (keeps manage.py and worker boot fast).
+_genai = None
+
+
+def _get_genai():
+    """Import and configure the Gemini client on first use."""
+    global _genai
+    if _genai is None:
+        start = time.perf_counter()
+        import google.generativeai as genai
+        genai.configure(api_key=os.getenv("GEMINI_API_KEY"))
+        elapsed_ms = (time.perf_counter() - start) * 1000
+        print(f"⏱️ Gemini client loaded in {elapsed_ms:.1f} ms")
+        _genai = genai
+    return _genai
+
 
 def save_full_cache(final_output):
     """Always rewrite the cache with the final complete JSON output."""
@@ -13,7 +38,7 @@ def save_full_cache(final_output):
 
 def _generate_with_fallback(prompt, context="general"):
     """Generate text using available Gemini models with fallback and log progress."""
-    genai.configure(api_key=os.getenv("GEMINI_API_KEY"))
+    genai = _get_genai()
     model_names = [
         "models/gemini-2.5-flash",
         "models/gemini-2.5-pro",
@@ -33,12 +58,47 @@ def _generate_with_fallback(prompt, context="general"):
             continue
 
     print(f"❌ Failed to generate summary for: {context}")
-    return "Summary unavailable.", None
+    return SUMMARY_UNAVAILABLE, None
+
 
+def summarize_symbol(filename, content, name, kind):
+    """Summarize one function or class of a file."""
+    if kind == "class":
+        print(f"🏗️ Summarizing class: {name} in {filename}")
+        prompt = (
+            f"Summarize the purpose and behavior of the class `{name}` in this file:\n\n"
+            f"{content[:1500]}"
+        )
+    else:
+        print(f"🔍 Summarizing function: {name} in {filename}")
+        prompt = (
+            f"Explain briefly what the function `{name}` likely does based on its name and surrounding code:\n\n"
+            f"{content[:1500]}"
+        )
+    summary, _ = _generate_with_fallback(prompt, context=f"{filename}:{name}")
+    return summary
 
-def summarize_file(filename, content, language="unknown", functions=None, classes=None):
+
+def summarize_symbol_on_demand(filename, name, kind):
+    """
+    Summarize a symbol from the last lazy analysis the first time it is
+    requested. Once cached in the symbol store it is also picked up by the
+    search index. Returns None if the symbol is unknown.
+    """
+    return get_symbol_summary(
+        filename,
+        kind,
+        name,
+        lambda context: summarize_symbol(filename, context["content"], name, kind),
+        is_final=lambda summary: summary != SUMMARY_UNAVAILABLE,
+    )
+
+
+def summarize_file(filename, content, language="unknown", functions=None, classes=None, lazy_symbols=False):
     """
     Summarize a single file (file summary + function/class summaries).
+    With lazy_symbols, functions and classes are listed with a None summary
+    and summarized later through summarize_symbol_on_demand.
     Logs each stage for visibility.
     """
     print(f"\n🧩 Summarizing file: {filename} [{language}]")
@@ -51,29 +111,24 @@ def summarize_file(filename, content, language="unknown", functions=None, classe
     )
     file_summary, model = _generate_with_fallback(prompt, context=filename)
 
-    # --- Function-level summaries ---
-    function_summaries = []
-    if functions and model:
-        for func in functions:
-            print(f"🔍 Summarizing function: {func} in {filename}")
-            func_prompt = (
-                f"Explain briefly what the function `{func}` likely does based on its name and surrounding code:\n\n"
-                f"{content[:1500]}"
-            )
-            f_summary, _ = _generate_with_fallback(func_prompt, context=f"{filename}:{func}")
-            function_summaries.append({"name": func, "summary": f_summary})
-
-    # --- Class-level summaries ---
-    class_summaries = []
-    if classes and model:
-        for cls in classes:
-            print(f"🏗️ Summarizing class: {cls} in {filename}")
-            cls_prompt = (
-                f"Summarize the purpose and behavior of the class `{cls}` in this file:\n\n"
-                f"{content[:1500]}"
-            )
-            c_summary, _ = _generate_with_fallback(cls_prompt, context=f"{filename}:{cls}")
-            class_summaries.append({"name": cls, "summary": c_summary})
+    if lazy_symbols:
+        print(f"💤 Deferring {len(functions or [])} function / {len(classes or [])} class summaries for {filename}")
+        function_summaries = [{"name": func, "summary": None} for func in functions or []]
+        class_summaries = [{"name": cls, "summary": None} for cls in classes or []]
+    else:
+        # --- Function-level summaries ---
+        function_summaries = []
+        if functions and model:
+            for func in functions:
+                f_summary = summarize_symbol(filename, content, func, "function")
+                function_summaries.append({"name": func, "summary": f_summary})
+
+        # --- Class-level summaries ---
+        class_summaries = []
+        if classes and model:
+            for cls in classes:
+                c_summary = summarize_symbol(filename, content, cls, "class")
+                class_summaries.append({"name": cls, "summary": c_summary})
 
     print(f"🧠 Summary complete for {filename}")
     return {
@@ -84,10 +139,33 @@ def summarize_file(filename, content, language="unknown", functions=None, classe
     }
 
 
-def summarize_repository(repo_path, parsed_structure, frontend_framework="Unknown", backend_framework="Unknown", frameworks=None):
+def _is_complete(file_summary):
+    """A file is only checkpointed once every summary in it was generated."""
+    summaries = [file_summary["summary"]]
+    summaries += [s["summary"] for s in file_summary["functions"] + file_summary["classes"]]
+    return SUMMARY_UNAVAILABLE not in summaries
+
+
+def _has_deferred_symbols(file_summary):
+    return any(s["summary"] is None for s in file_summary["functions"] + file_summary["classes"])
+
+
+def summarize_repository(repo_path, parsed_structure, frontend_framework="Unknown", backend_framework="Unknown", frameworks=None,
+                         checkpoint_id=None, resume=False, lazy_symbols=False):
     """
     Generate AI-based summaries for all files in a repo + final project summary + graph.
     Verbose logs for full traceability.
+
+    With a checkpoint_id, each finished file summary is appended to a durable
+    checkpoint. With resume=True, files already in that checkpoint (and
+    unchanged since) are reused instead of being summarized again. The
+    checkpoint is only removed once the run is complete, i.e. every file and
+    the project summary were generated; the result reports this under
+    "complete" and lists any "incomplete_files".
+
+    With lazy_symbols=True only file and project summaries are generated;
+    the source context of each file is stored so function/class summaries
+    can be produced on first request.
     """
     print(f"\n🚀 Starting repository summarization for: {repo_path}")
     files_data = []
@@ -95,6 +173,16 @@ def summarize_repository(repo_path, parsed_structure, frontend_framework="Unknow
     total_files = len(parsed_structure)
     print(f"📁 Files to summarize: {total_files}")
 
+    symbol_context = {}
+    incomplete_files = []
+    completed = {}
+    if checkpoint_id:
+        prune_checkpoints(keep=checkpoint_id)
+        if resume:
+            completed = load_checkpoint(checkpoint_id)
+        else:
+            clear_checkpoint(checkpoint_id)
+
     for index, (file, data) in enumerate(parsed_structure.items(), start=1):
         file_path = os.path.join(repo_path, file)
         if not os.path.exists(file_path):
@@ -106,25 +194,42 @@ def summarize_repository(repo_path, parsed_structure, frontend_framework="Unknow
             with open(file_path, "r", encoding="utf-8", errors="ignore") as f:
                 content = f.read()
 
-            language = (
-                "Python" if file.endswith(".py") else
-                "JavaScript" if file.endswith((".js", ".jsx")) else
-                "HTML" if file.endswith(".html") else
-                "CSS" if file.endswith(".css") else
-                "text"
-            )
+            if lazy_symbols:
+                symbol_context[file] = {
+                    "language": get_language(file),
+                    "content": content[:1500],
+                    "functions": data.get("functions", []),
+                    "classes": data.get("classes", [])
+                }
+
+            file_hash = content_hash(content)
+            if file in completed and completed[file]["hash"] == file_hash and (
+                lazy_symbols or not _has_deferred_symbols(completed[file]["summary"])
+            ):
+                print(f"⏭️ Resuming: {file} already summarized in checkpoint")
+                files_data.append(completed[file]["summary"])
+                continue
+
+            language = get_language(file)
 
             file_summary = summarize_file(
                 file,
                 content,
                 language,
                 functions=data.get("functions", []),
-                classes=data.get("classes", [])
+                classes=data.get("classes", []),
+                lazy_symbols=lazy_symbols
             )
             files_data.append(file_summary)
 
+            if not _is_complete(file_summary):
+                incomplete_files.append(file)
+            elif checkpoint_id:
+                record_file(checkpoint_id, file, file_hash, file_summary)
+
         except Exception as e:
             print(f"❌ Error summarizing {file}: {e}")
+            incomplete_files.append(file)
             files_data.append({
                 "name": file,
                 "summary": f"Error summarizing file: {e}",
@@ -132,6 +237,11 @@ def summarize_repository(repo_path, parsed_structure, frontend_framework="Unknow
                 "classes": []
             })
 
+    # Always replace the store, so an eager run does not leave symbols from
+    # an earlier lazy run servable through /api/symbol/.
+    analysis_id = uuid.uuid4().hex
+    save_symbol_context(symbol_context, analysis_id)
+
     print("\n🧩 Generating overall project summary...")
     combined_text = "\n".join([f"{f['name']}: {f['summary']}" for f in files_data])
     project_prompt = (
@@ -152,13 +262,20 @@ def summarize_repository(repo_path, parsed_structure, frontend_framework="Unknow
         links.append({"source": "repository", "target": f["name"]})
 
         for func in f["functions"]:
-            nodes.append({"id": func["name"], "label": func["name"]})
+            nodes.append({"id": func["name"], "label": func["name"], "file": f["name"], "kind": "function"})
             links.append({"source": f["name"], "target": func["name"]})
 
         for cls in f["classes"]:
-            nodes.append({"id": cls["name"], "label": cls["name"]})
+            nodes.append({"id": cls["name"], "label": cls["name"], "file": f["name"], "kind": "class"})
             links.append({"source": f["name"], "target": cls["name"]})
 
+    # --- Layout (computed once here so the client only draws) ---
+    # Imported here so numpy is not loaded when api.views is imported.
+    from analyzer.graph_layout import compute_layout
+    layout = compute_layout(nodes, links)
+
+    complete = not incomplete_files and project_summary != SUMMARY_UNAVAILABLE
+
     # --- Final Output ---
     final_output = {
         "frontend_framework": frontend_framework or "Unknown",
@@ -171,9 +288,20 @@ def summarize_repository(repo_path, parsed_structure, frontend_framework="Unknow
             "files": files_data
         },
         "nodes": nodes,
-        "links": links
+        "links": links,
+        "layout": layout,
+        "lazy_symbols": lazy_symbols,
+        "complete": complete,
+        "incomplete_files": incomplete_files,
+        "checkpoint_id": checkpoint_id
     }
 
     save_full_cache(final_output)
-    print(f"\n✅ Repository summarized successfully → {len(files_data)} files processed.")
+    if checkpoint_id and complete:
+        clear_checkpoint(checkpoint_id)
+    save_search_index(build_search_index(files_data, parsed_structure, project_summary, analysis_id))
+    if complete:
+        print(f"\n✅ Repository summarized successfully → {len(files_data)} files processed.")
+    else:
+        print(f"\n⚠️ Repository summarized with {len(incomplete_files)} incomplete files → resume to finish them.")
     return final_output
@@ -0,0 +1,93 @@
+import os
+import json
+import time
+import hashlib
+
+CHECKPOINT_DIR = "checkpoints"
+# Checkpoints of abandoned runs are dropped after a week, and only the most
+# recently updated ones are kept.
+MAX_CHECKPOINT_AGE = 7 * 24 * 3600
+MAX_CHECKPOINTS = 50
+
+
+def checkpoint_id_for(key):
+    """Stable, filename-safe id for an analysis (e.g. a repo URL or ZIP content hash)."""
+    return hashlib.sha1(key.strip().lower().encode("utf-8")).hexdigest()[:16]
+
+
+def content_hash(content):
+    return hashlib.sha1(content.encode("utf-8", errors="ignore")).hexdigest()
+
+
+def _checkpoint_path(checkpoint_id):
+    return os.path.join(CHECKPOINT_DIR, f"{checkpoint_id}.jsonl")
+
+
+def load_checkpoint(checkpoint_id):
+    """
+    Return {file name: {"hash": ..., "summary": ...}} for every file already
+    summarized under this checkpoint. A line cut short by a crash is ignored.
+    """
+    path = _checkpoint_path(checkpoint_id)
+    if not os.path.exists(path):
+        return {}
+
+    completed = {}
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            try:
+                entry = json.loads(line)
+            except json.JSONDecodeError:
+                continue
+            completed[entry["name"]] = entry
+    print(f"📂 Loaded checkpoint {checkpoint_id} → {len(completed)} files already summarized")
+    return completed
+
+
+def record_file(checkpoint_id, name, file_hash, summary):
+    """Append one finished file summary and fsync, so it survives a crash."""
+    os.makedirs(CHECKPOINT_DIR, exist_ok=True)
+    entry = {"name": name, "hash": file_hash, "summary": summary}
+    with open(_checkpoint_path(checkpoint_id), "a", encoding="utf-8") as f:
+        f.write(json.dumps(entry, ensure_ascii=False) + "\n")
+        f.flush()
+        os.fsync(f.fileno())
+
+
+def clear_checkpoint(checkpoint_id):
+    path = _checkpoint_path(checkpoint_id)
+    if os.path.exists(path):
+        os.remove(path)
+
+
+def prune_checkpoints(keep=None):
+    """
+    Delete checkpoints older than MAX_CHECKPOINT_AGE, then the oldest ones
+    beyond MAX_CHECKPOINTS. The checkpoint `keep` is never deleted.
+    """
+    if not os.path.isdir(CHECKPOINT_DIR):
+        return
+
+    entries = []
+    for name in os.listdir(CHECKPOINT_DIR):
+        path = os.path.join(CHECKPOINT_DIR, name)
+        if not name.endswith(".jsonl") or name == f"{keep}.jsonl":
+            continue
+        try:
+            entries.append((os.path.getmtime(path), path))
+        except FileNotFoundError:
+            continue
+
+    entries.sort(reverse=True)
+    cutoff = time.time() - MAX_CHECKPOINT_AGE
+    limit = MAX_CHECKPOINTS - (1 if keep else 0)
+    removed = 0
+    for rank, (mtime, path) in enumerate(entries):
+        if mtime < cutoff or rank >= limit:
+            try:
+                os.remove(path)
+                removed += 1
+            except FileNotFoundError:
+                pass
+    if removed:
+        print(f"🧹 Pruned {removed} stale checkpoints")
@@ -1,24 +1,68 @@
 import os
-from analyzer.parser_py import parse_python_code
-from analyzer.parser_js import parse_js_code
-from analyzer.parser_html import parse_html_code
-from analyzer.parser_css import parse_css_code
+import time
+from importlib import import_module
+
+# Extension → (parser module, parser function, language label).
+# Parser modules are only imported the first time a matching file is seen,
+# so repos without HTML/CSS never pay for BeautifulSoup or tinycss2.
+PARSER_REGISTRY = {
+    ".py": ("analyzer.parser_py", "parse_python_code", "Python"),
+    ".js": ("analyzer.parser_js", "parse_js_code", "JavaScript"),
+    ".jsx": ("analyzer.parser_js", "parse_js_code", "JavaScript"),
+    ".html": ("analyzer.parser_html", "parse_html_code", "HTML"),
+    ".css": ("analyzer.parser_css", "parse_css_code", "CSS"),
+}
+
+_loaded_parsers = {}
+
+
+def register_parser(extensions, module, function, language):
+    """Register a parser for one or more file extensions (e.g. ".ts", ".tsx")."""
+    if isinstance(extensions, str):
+        extensions = [extensions]
+    for ext in extensions:
+        PARSER_REGISTRY[ext.lower()] = (module, function, language)
+        _loaded_parsers.pop(ext.lower(), None)
+
+
+def _extension(filename):
+    return os.path.splitext(filename)[1].lower()
+
+
+def get_language(filename, default="text"):
+    """Return the language label for a file based on its extension."""
+    entry = PARSER_REGISTRY.get(_extension(filename))
+    return entry[2] if entry else default
+
+
+def get_parser(filename):
+    """Return the parser function for a file, importing its module on first use."""
+    ext = _extension(filename)
+    if ext not in PARSER_REGISTRY:
+        return None
+
+    parser = _loaded_parsers.get(ext)
+    if parser is None:
+        module_name, function_name, _ = PARSER_REGISTRY[ext]
+        start = time.perf_counter()
+        parser = getattr(import_module(module_name), function_name)
+        elapsed_ms = (time.perf_counter() - start) * 1000
+        print(f"⏱️ Loaded parser for {ext} ({module_name}) in {elapsed_ms:.1f} ms")
+        _loaded_parsers[ext] = parser
+    return parser
+
 
 def analyze_code_structure(repo_path):
     parsed_data = {}
     for root, _, files in os.walk(repo_path):
         for file in files:
-            if file.endswith((".py", ".js", ".jsx", ".html", ".css")):
-                path = os.path.join(root, file)
-                with open(path, "r", encoding="utf-8", errors="ignore") as f:
-                    content = f.read()
-
-                if file.endswith(".py"):
-                    parsed_data[file] = parse_python_code(content)
-                elif file.endswith((".js", ".jsx")):
-                    parsed_data[file] = parse_js_code(content)
-                elif file.endswith(".html"):
-                    parsed_data[file] = parse_html_code(content)
-                elif file.endswith(".css"):
-                    parsed_data[file] = parse_css_code(content)
+            parser = get_parser(file)
+            if parser is None:
+                continue
+
+            path = os.path.join(root, file)
+            with open(path, "r", encoding="utf-8", errors="ignore") as f:
+                content = f.read()
+
+            parsed_data[file] = parser(content)
     return parsed_data
@@ -0,0 +1,199 @@
+import math
+import time
+
+import numpy as np
+
+# Same forces the frontend used to run with d3.forceSimulation:
+# forceLink().distance(120), forceManyBody().strength(-350), forceCenter().
+LINK_DISTANCE = 120.0
+CHARGE_STRENGTH = -350.0
+VELOCITY_DECAY = 0.4
+ALPHA_MIN = 0.001
+ITERATIONS = 300
+
+# Above this many nodes, repulsion uses a grid approximation instead of all
+# pairs. Both cost ~0.7 ms per iteration at 100 nodes; beyond that the exact
+# O(n²) path (which also allocates n×n×2 temporaries) quickly dominates.
+EXACT_REPULSION_LIMIT = 100
+MIN_DISTANCE_SQ = 1.0
+
+_FAR_OFFSETS = np.array(
+    [(dx, dy) for dx in range(-3, 4) for dy in range(-3, 4) if abs(dx) > 1 or abs(dy) > 1]
+)
+# Own cell plus half of the 8 neighbours; the other half is covered by symmetry.
+_NEAR_OFFSETS = ((0, 0), (0, 1), (1, -1), (1, 0), (1, 1))
+
+
+def _initial_positions(count):
+    """Phyllotaxis spiral, the same deterministic seed layout d3 uses."""
+    i = np.arange(count, dtype=float)
+    radius = 10.0 * np.sqrt(0.5 + i)
+    angle = i * math.pi * (3 - math.sqrt(5))
+    return np.column_stack((radius * np.cos(angle), radius * np.sin(angle)))
+
+
+def _exact_repulsion(pos, strength):
+    """All-pairs many-body force, O(n²) but fully vectorized."""
+    delta = pos[:, None, :] - pos[None, :, :]
+    dist_sq = np.maximum((delta ** 2).sum(axis=2), MIN_DISTANCE_SQ)
+    np.fill_diagonal(dist_sq, np.inf)
+    return -(delta * (strength / dist_sq)[:, :, None]).sum(axis=1)
+
+
+def _pairs_between(order_start, counts, cell_j, node_i):
+    """Expand (node, neighbour cell) into every (node, node in that cell) pair."""
+    lengths = counts[cell_j]
+    total = int(lengths.sum())
+    if total == 0:
+        return np.empty(0, dtype=int), np.empty(0, dtype=int)
+    offsets = np.repeat(np.cumsum(lengths) - lengths, lengths)
+    rank = np.arange(total) - offsets
+    return np.repeat(node_i, lengths), order_start[np.repeat(cell_j, lengths)] + rank
+
+
+def _grid_repulsion(pos, strength):
+    """
+    Grid (Barnes-Hut style) approximation of the many-body force.
+
+    Space is split into a pyramid of grids. At each level a cell is pushed by
+    the centre of mass of every cell that is a child of its parent's
+    neighbours but not itself adjacent, and at the finest level nodes in
+    adjacent cells repel each other exactly. Cost is roughly linear in the
+    number of nodes instead of quadratic.
+
+    Far-field forces are evaluated at cell centroids, so the total error is
+    around 5-7% of the exact force. Per node it stays below ~25% of the RMS
+    force; relative to a single node's own force it can be much larger
+    where the exact forces nearly cancel out.
+    """
+    count = len(pos)
+    levels = max(2, math.ceil(math.log2(math.sqrt(count / 2))))
+    low = pos.min(axis=0)
+    span = np.maximum(pos.max(axis=0) - low, 1e-9)
+    unit = np.minimum((pos - low) / span, 1 - 1e-9)
+    force = np.zeros_like(pos)
+
+    # Far field, coarse to fine. Only occupied cells are visited.
+    offset_x = _FAR_OFFSETS[:, 0, None]
+    offset_y = _FAR_OFFSETS[:, 1, None]
+    for level in range(2, levels + 1):
+        side = 2 ** level
+        cx, cy = (unit * side).astype(int).T
+        cell = cx * side + cy
+        counts = np.bincount(cell, minlength=side * side).astype(float)
+        occupied = np.flatnonzero(counts)
+        mass = counts[occupied]
+        centroid_x = np.zeros(side * side)
+        centroid_y = np.zeros(side * side)
+        centroid_x[occupied] = np.bincount(cell, pos[:, 0], side * side)[occupied] / mass
+        centroid_y[occupied] = np.bincount(cell, pos[:, 1], side * side)[occupied] / mass
+
+        # Interaction list: children of the parent's neighbours that are not
+        # adjacent to the cell itself.
+        ox, oy = occupied // side, occupied % side
+        px, py = ox % 2, oy % 2
+        sx, sy = ox + offset_x, oy + offset_y
+        valid = (
+            (sx >= 0) & (sx < side) & (sy >= 0) & (sy < side)
+            & (offset_x >= -2 - px) & (offset_x <= 3 - px)
+            & (offset_y >= -2 - py) & (offset_y <= 3 - py)
+        )
+        source = np.where(valid, sx * side + sy, 0)
+        source_mass = counts[source] * valid
+        delta_x = centroid_x[occupied] - centroid_x[source]
+        delta_y = centroid_y[occupied] - centroid_y[source]
+        weight = -strength * source_mass / np.maximum(delta_x * delta_x + delta_y * delta_y, MIN_DISTANCE_SQ)
+
+        cell_force_x = np.zeros(side * side)
+        cell_force_y = np.zeros(side * side)
+        cell_force_x[occupied] = (delta_x * weight).sum(axis=0)
+        cell_force_y[occupied] = (delta_y * weight).sum(axis=0)
+        force[:, 0] += cell_force_x[cell]
+        force[:, 1] += cell_force_y[cell]
+
+    # Near field: exact pairs between nodes in the same or adjacent finest
+    # cells. Each pair is visited once and pushes both ends.
+    side = 2 ** levels
+    cx, cy = (unit * side).astype(int).T
+    cell = cx * side + cy
+    order = np.argsort(cell, kind="stable")
+    counts = np.bincount(cell, minlength=side * side)
+    order_start = np.cumsum(counts) - counts
+    nodes = np.arange(count)
+    x, y = pos[:, 0], pos[:, 1]
+    for dx, dy in _NEAR_OFFSETS:
+        nx, ny = cx + dx, cy + dy
+        inside = (nx >= 0) & (nx < side) & (ny >= 0) & (ny < side)
+        i, j = _pairs_between(order_start, counts, nx[inside] * side + ny[inside], nodes[inside])
+        j = order[j]
+        keep = i < j if dx == dy == 0 else slice(None)
+        i, j = i[keep], j[keep]
+        delta_x, delta_y = x[i] - x[j], y[i] - y[j]
+        weight = -strength / np.maximum(delta_x * delta_x + delta_y * delta_y, MIN_DISTANCE_SQ)
+        push_x, push_y = delta_x * weight, delta_y * weight
+        force[:, 0] += np.bincount(i, push_x, count) - np.bincount(j, push_x, count)
+        force[:, 1] += np.bincount(i, push_y, count) - np.bincount(j, push_y, count)
+    return force
+
+
+def compute_layout(nodes, links, iterations=ITERATIONS):
+    """
+    Run a force-directed layout once on the server and write `x` / `y` onto
+    each node, so the client only has to draw. Returns the layout bounds.
+    """
+    count = len(nodes)
+    if count == 0:
+        return {"x_min": 0, "x_max": 0, "y_min": 0, "y_max": 0, "iterations": 0}
+
+    start = time.perf_counter()
+    # Duplicate ids resolve to the last node, matching d3.forceLink's id lookup.
+    index_of = {node["id"]: i for i, node in enumerate(nodes)}
+    edges = np.array(
+        [
+            (index_of[l["source"]], index_of[l["target"]])
+            for l in links
+            if l["source"] in index_of and l["target"] in index_of and l["source"] != l["target"]
+        ],
+        dtype=int,
+    ).reshape(-1, 2)
+    src, dst = edges[:, 0], edges[:, 1]
+
+    degree = np.bincount(edges.ravel(), minlength=count).astype(float)
+    link_strength = 1.0 / np.maximum(np.minimum(degree[src], degree[dst]), 1.0)
+    link_bias = degree[src] / np.maximum(degree[src] + degree[dst], 1.0)
+
+    pos = _initial_positions(count)
+    vel = np.zeros_like(pos)
+    repulsion = _exact_repulsion if count <= EXACT_REPULSION_LIMIT else _grid_repulsion
+    alpha_decay = 1 - ALPHA_MIN ** (1 / iterations)
+    alpha = 1.0
+
+    for _ in range(iterations):
+        alpha += (0 - alpha) * alpha_decay
+
+        # Links pull endpoints toward LINK_DISTANCE apart.
+        if len(edges):
+            delta = (pos[dst] + vel[dst]) - (pos[src] + vel[src])
+            dist = np.maximum(np.sqrt((delta ** 2).sum(axis=1)), 1e-6)
+            shift = delta * ((dist - LINK_DISTANCE) / dist * alpha * link_strength)[:, None]
+            np.add.at(vel, dst, -shift * link_bias[:, None])
+            np.add.at(vel, src, shift * (1 - link_bias)[:, None])
+
+        vel += repulsion(pos, CHARGE_STRENGTH) * alpha
+        vel *= 1 - VELOCITY_DECAY
+        pos += vel
+        pos -= pos.mean(axis=0)
+
+    for node, (x, y) in zip(nodes, pos):
+        node["x"] = round(float(x), 2)
+        node["y"] = round(float(y), 2)
+
+    elapsed = time.perf_counter() - start
+    print(f"🕸️ Graph layout computed for {count} nodes in {elapsed:.2f} s")
+    return {
+        "x_min": round(float(pos[:, 0].min()), 2),
+        "x_max": round(float(pos[:, 0].max()), 2),
+        "y_min": round(float(pos[:, 1].min()), 2),
+        "y_max": round(float(pos[:, 1].max()), 2),
+        "iterations": iterations,
+    }
@@ -0,0 +1,244 @@
+import os
+import re
+import json
+import math
+import time
+import tempfile
+import threading
+from bisect import bisect_left, insort
+
+from analyzer.symbol_store import summaries_since
+
+INDEX_PATH = "search_index.json"
+
+# BM25 parameters
+K1 = 1.2
+B = 0.75
+
+# Field weights: a term in a symbol name counts more than one in a summary.
+NAME_WEIGHT = 3
+PATH_WEIGHT = 2
+IMPORT_WEIGHT = 1
+SUMMARY_WEIGHT = 1
+# The file a symbol lives in: enough to find it by path, but below the file's own doc.
+SYMBOL_FILE_WEIGHT = 1
+
+# Prefix matches ("auth" → "authentication") score below exact matches.
+PREFIX_WEIGHT = 0.5
+MAX_PREFIX_EXPANSIONS = 50
+
+STOPWORDS = {
+    "a", "an", "and", "are", "as", "at", "be", "by", "does", "for", "from",
+    "how", "in", "is", "it", "of", "on", "or", "the", "this", "to", "what",
+    "where", "which", "who", "with",
+}
+
+_WORD_RE = re.compile(r"[A-Za-z0-9]+")
+_CAMEL_RE = re.compile(r"[A-Z]+(?=[A-Z][a-z])|[A-Z]?[a-z]+|[A-Z]+|[0-9]+")
+
+# Keys rebuilt on load and never written to disk.
+_DERIVED_KEYS = ("terms", "symbol_docs", "overlay_seq")
+
+_loaded = {"path": None, "mtime": None, "index": None}
+_overlay_lock = threading.Lock()
+
+
+def tokenize(text):
+    """
+    Split text into lowercase terms. Identifiers are also split on
+    camelCase / snake_case boundaries, so `parseHtmlCode` yields
+    `parsehtmlcode`, `parse`, `html` and `code`.
+    """
+    terms = []
+    for word in _WORD_RE.findall(text or ""):
+        lower = word.lower()
+        if lower not in STOPWORDS:
+            terms.append(lower)
+        parts = _CAMEL_RE.findall(word)
+        if len(parts) > 1:
+            terms.extend(p.lower() for p in parts if p.lower() not in STOPWORDS)
+    return terms
+
+
+def _add_document(index, doc, weighted_fields):
+    doc_id = len(index["docs"])
+    counts = {}
+    for text, weight in weighted_fields:
+        for term in tokenize(text):
+            counts[term] = counts.get(term, 0) + weight
+
+    index["docs"].append(doc)
+    index["doc_lengths"].append(sum(counts.values()))
+    for term, tf in counts.items():
+        index["postings"].setdefault(term, []).append([doc_id, tf])
+
+
+def build_search_index(files_data, parsed_structure=None, project_summary="", analysis_id=None):
+    """
+    Build an inverted index over file paths, qualified symbol names
+    (`file:symbol`), imports and generated summaries. `analysis_id` links
+    it to the symbol store, whose on-demand summaries are overlaid on load.
+    """
+    parsed_structure = parsed_structure or {}
+    index = {"docs": [], "doc_lengths": [], "postings": {}, "avg_length": 0.0, "analysis_id": analysis_id}
+
+    if project_summary:
+        _add_document(
+            index,
+            {"id": "repository", "type": "repository", "name": "repository", "file": None, "summary": project_summary},
+            [(project_summary, SUMMARY_WEIGHT)],
+        )
+
+    for f in files_data:
+        imports = parsed_structure.get(f["name"], {}).get("imports", [])
+        _add_document(
+            index,
+            {"id": f["name"], "type": "file", "name": f["name"], "file": f["name"], "summary": f.get("summary", "")},
+            [
+                (f["name"], PATH_WEIGHT),
+                (" ".join(imports), IMPORT_WEIGHT),
+                (f.get("summary", ""), SUMMARY_WEIGHT),
+            ],
+        )
+
+        for kind, key in (("function", "functions"), ("class", "classes")):
+            for symbol in f.get(key, []):
+                qualified = f"{f['name']}:{symbol['name']}"
+                _add_document(
+                    index,
+                    {"id": qualified, "type": kind, "name": symbol["name"], "file": f["name"], "summary": symbol.get("summary", "")},
+                    [
+                        (symbol["name"], NAME_WEIGHT),
+                        (f["name"], SYMBOL_FILE_WEIGHT),
+                        (symbol.get("summary", ""), SUMMARY_WEIGHT),
+                    ],
+                )
+
+    if index["doc_lengths"]:
+        index["avg_length"] = sum(index["doc_lengths"]) / len(index["doc_lengths"])
+    _add_derived_keys(index)
+    return index
+
+
+def _add_derived_keys(index):
+    index["terms"] = sorted(index["postings"])
+    index["symbol_docs"] = {
+        (doc["type"], doc["file"], doc["name"]): i
+        for i, doc in enumerate(index["docs"])
+        if doc["type"] in ("function", "class")
+    }
+    index["overlay_seq"] = 0
+
+
+def save_search_index(index, path=INDEX_PATH):
+    """Atomically persist the index next to the summary cache."""
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(os.path.abspath(path)), suffix=".tmp")
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            json.dump({k: v for k, v in index.items() if k not in _DERIVED_KEYS}, f, ensure_ascii=False)
+        os.replace(tmp_path, path)
+    except BaseException:
+        os.remove(tmp_path)
+        raise
+    print(f"🔎 Search index updated → {path} ({len(index['docs'])} documents)")
+
+
+def load_search_index(path=INDEX_PATH):
+    """
+    Load the index from disk, reusing the in-memory copy until the file
+    changes, then apply symbol summaries cached since the last load.
+    """
+    if not os.path.exists(path):
+        return None
+
+    mtime = os.path.getmtime(path)
+    if _loaded["path"] == path and _loaded["mtime"] == mtime:
+        index = _loaded["index"]
+    else:
+        with open(path, "r", encoding="utf-8") as f:
+            index = json.load(f)
+        _add_derived_keys(index)
+        _loaded.update(path=path, mtime=mtime, index=index)
+
+    _apply_overlay(index)
+    return index
+
+
+def _apply_overlay(index):
+    """Add on-demand symbol summaries (lazy mode) from the symbol store to the in-memory index."""
+    if not index.get("analysis_id"):
+        return
+    with _overlay_lock:
+        for seq, filename, kind, name, summary in summaries_since(index["analysis_id"], index["overlay_seq"]):
+            _add_symbol_summary(index, kind, filename, name, summary)
+            index["overlay_seq"] = seq
+
+
+def _add_symbol_summary(index, kind, filename, name, summary):
+    doc_id = index["symbol_docs"].get((kind, filename, name))
+    if doc_id is None or index["docs"][doc_id]["summary"]:
+        return
+
+    counts = {}
+    for term in tokenize(summary):
+        counts[term] = counts.get(term, 0) + SUMMARY_WEIGHT
+    for term, tf in counts.items():
+        postings = index["postings"].get(term)
+        if postings is None:
+            index["postings"][term] = [[doc_id, tf]]
+            insort(index["terms"], term)
+            continue
+        # Postings stay sorted by doc id, so the doc's entry is found by bisection.
+        pos = bisect_left(postings, doc_id, key=lambda posting: posting[0])
+        if pos < len(postings) and postings[pos][0] == doc_id:
+            postings[pos][1] += tf
+        else:
+            postings.insert(pos, [doc_id, tf])
+
+    added = sum(counts.values())
+    index["doc_lengths"][doc_id] += added
+    index["avg_length"] += added / len(index["doc_lengths"])
+    index["docs"][doc_id]["summary"] = summary
+
+
+def _expand_term(index, term):
+    """Return [(index_term, weight)] for an exact match plus identifier prefixes."""
+    terms = index["terms"]
+    matches = []
+    if term in index["postings"]:
+        matches.append((term, 1.0))
+
+    pos = bisect_left(terms, term)
+    expansions = 0
+    while pos < len(terms) and terms[pos].startswith(term) and expansions < MAX_PREFIX_EXPANSIONS:
+        if terms[pos] != term:
+            matches.append((terms[pos], PREFIX_WEIGHT))
+            expansions += 1
+        pos += 1
+    return matches
+
+
+def search(index, query, limit=20):
+    """Rank documents against the query with BM25 and return the top hits."""
+    start = time.perf_counter()
+    total_docs = len(index["docs"])
+    avg_length = index["avg_length"] or 1.0
+    scores = {}
+
+    for term in set(tokenize(query)):
+        for match, weight in _expand_term(index, term):
+            postings = index["postings"][match]
+            idf = math.log(1 + (total_docs - len(postings) + 0.5) / (len(postings) + 0.5))
+            for doc_id, tf in postings:
+                norm = K1 * (1 - B + B * index["doc_lengths"][doc_id] / avg_length)
+                score = weight * idf * tf * (K1 + 1) / (tf + norm)
+                scores[doc_id] = scores.get(doc_id, 0.0) + score
+
+    ranked = sorted(scores.items(), key=lambda item: item[1], reverse=True)[:limit]
+    results = [dict(index["docs"][doc_id], score=round(score, 4)) for doc_id, score in ranked]
+    return {
+        "query": query,
+        "total": len(scores),
+        "results": results,
+        "took_ms": round((time.perf_counter() - start) * 1000, 2),
+    }
@@ -0,0 +1,137 @@
+import os
+import json
+import sqlite3
+import threading
+from concurrent.futures import Future
+from contextlib import closing
+
+SYMBOL_STORE_PATH = "symbol_store.sqlite3"
+SYMBOL_KINDS = {"function": "functions", "class": "classes"}
+
+# One row per file context and per generated summary. SQLite's own file
+# locking serialises writers across worker processes, and each new summary
+# is a single-row insert rather than a rewrite of the whole store.
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS analysis (
+    id INTEGER PRIMARY KEY CHECK (id = 1),
+    analysis_id TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS files (
+    name TEXT PRIMARY KEY,
+    context TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS summaries (
+    seq INTEGER PRIMARY KEY AUTOINCREMENT,
+    analysis_id TEXT NOT NULL,
+    file TEXT NOT NULL,
+    kind TEXT NOT NULL,
+    name TEXT NOT NULL,
+    summary TEXT NOT NULL,
+    UNIQUE (analysis_id, file, kind, name)
+);
+"""
+
+# Coalesces concurrent requests for the same symbol within this process.
+_lock = threading.Lock()
+# "analysis:file:kind:name" → Future for summaries currently being generated.
+_in_flight = {}
+
+
+def _connect(path=SYMBOL_STORE_PATH):
+    conn = sqlite3.connect(path, timeout=30)
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.executescript(_SCHEMA)
+    return conn
+
+
+def _current_analysis(conn):
+    row = conn.execute("SELECT analysis_id FROM analysis WHERE id = 1").fetchone()
+    return row[0] if row else None
+
+
+def save_symbol_context(files, analysis_id):
+    """
+    Store the source context needed to summarize symbols later:
+    {file name: {"language", "content", "functions", "classes"}}.
+    Replaces the previous analysis and its cached symbol summaries.
+    """
+    with closing(_connect()) as conn, conn:
+        conn.execute("DELETE FROM files")
+        conn.execute("DELETE FROM summaries")
+        conn.execute("INSERT OR REPLACE INTO analysis (id, analysis_id) VALUES (1, ?)", (analysis_id,))
+        conn.executemany(
+            "INSERT INTO files (name, context) VALUES (?, ?)",
+            [(name, json.dumps(context, ensure_ascii=False)) for name, context in files.items()],
+        )
+    print(f"🗂️ Symbol context stored for {len(files)} files → {SYMBOL_STORE_PATH}")
+
+
+def summaries_since(analysis_id, seq=0):
+    """Summaries cached for an analysis after `seq`, as (seq, file, kind, name, summary) rows."""
+    if not os.path.exists(SYMBOL_STORE_PATH):
+        return []
+    with closing(_connect()) as conn:
+        return conn.execute(
+            "SELECT seq, file, kind, name, summary FROM summaries "
+            "WHERE analysis_id = ? AND seq > ? ORDER BY seq",
+            (analysis_id, seq),
+        ).fetchall()
+
+
+def get_symbol_summary(filename, kind, name, generate, is_final=lambda summary: True):
+    """
+    Return the cached summary for a symbol, or produce it with
+    generate(context). Concurrent requests for the same symbol in this
+    process wait on the first one instead of generating it again. Results
+    for which is_final() is false are returned but not cached, so they are
+    retried next time. Returns None if the symbol is not part of the stored
+    analysis.
+    """
+    if kind not in SYMBOL_KINDS:
+        return None
+
+    with closing(_connect()) as conn:
+        analysis_id = _current_analysis(conn)
+        row = conn.execute(
+            "SELECT summary FROM summaries WHERE analysis_id = ? AND file = ? AND kind = ? AND name = ?",
+            (analysis_id, filename, kind, name),
+        ).fetchone()
+        if row:
+            return row[0]
+        row = conn.execute("SELECT context FROM files WHERE name = ?", (filename,)).fetchone()
+
+    context = json.loads(row[0]) if row else None
+    if context is None or name not in context.get(SYMBOL_KINDS[kind], []):
+        return None
+
+    key = f"{analysis_id}:{filename}:{kind}:{name}"
+    with _lock:
+        future = _in_flight.get(key)
+        owner = future is None
+        if owner:
+            future = Future()
+            _in_flight[key] = future
+
+    if not owner:
+        print(f"⏳ Waiting for in-flight summary: {key}")
+        return future.result()
+
+    try:
+        summary = generate(context)
+        if is_final(summary):
+            # Only stored if the analysis was not replaced meanwhile; if
+            # another worker stored the symbol first, its row is kept.
+            with closing(_connect()) as conn, conn:
+                conn.execute(
+                    "INSERT OR IGNORE INTO summaries (analysis_id, file, kind, name, summary) "
+                    "SELECT ?, ?, ?, ?, ? FROM analysis WHERE id = 1 AND analysis_id = ?",
+                    (analysis_id, filename, kind, name, summary, analysis_id),
+                )
+        future.set_result(summary)
+        return summary
+    except Exception as e:
+        future.set_exception(e)
+        raise
+    finally:
+        with _lock:
+            _in_flight.pop(key, None)
@@ -1,3 +1,382 @@
+import hashlib
+import io
+import os
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import zipfile
+from unittest import mock
+
+from django.conf import settings
+from django.core.files.uploadedfile import SimpleUploadedFile
 from django.test import TestCase
 
-# Create your tests here.
+from analyzer import ai_summarizer, checkpoint, graph_layout, symbol_store
+from analyzer.code_parser import analyze_code_structure
+from analyzer.search_index import build_search_index, load_search_index, search
+
+# Heavy third-party packages that must only load on first use.
+DEFERRED_MODULES = ["google.generativeai", "bs4", "tinycss2", "numpy"]
+
+
+class ImportTimeTests(TestCase):
+    def test_api_views_defers_heavy_imports(self):
+        code = (
+            "import sys, django; django.setup(); import api.views; "
+            f"print(','.join(m for m in {DEFERRED_MODULES!r} if m in sys.modules))"
+        )
+        result = subprocess.run(
+            [sys.executable, "-c", code],
+            cwd=settings.BASE_DIR,
+            env={**os.environ, "DJANGO_SETTINGS_MODULE": "core.settings"},
+            capture_output=True,
+            text=True,
+            check=True,
+        )
+        self.assertEqual(result.stdout.strip(), "")
+
+
+class SearchIndexTests(TestCase):
+    def setUp(self):
+        self.index = build_search_index(
+            [
+                {
+                    "name": "backends.py",
+                    "summary": "Custom backends for the project.",
+                    "functions": [{"name": "authenticate", "summary": "Checks a password."}],
+                    "classes": [{"name": "AuthBackend", "summary": "Session backend."}],
+                },
+                {
+                    "name": "views.py",
+                    "summary": "Renders the landing page.",
+                    "functions": [{"name": "render_page", "summary": "Returns HTML."}],
+                    "classes": [],
+                },
+            ],
+            {"views.py": {"imports": ["django.shortcuts"]}},
+            project_summary="A small web app.",
+        )
+
+    def test_prefix_matches_identifiers(self):
+        ids = [r["id"] for r in search(self.index, "where is auth handled")["results"]]
+        self.assertEqual(set(ids[:2]), {"backends.py:AuthBackend", "backends.py:authenticate"})
+        self.assertNotIn("views.py", ids)
+
+    def test_exact_match_outranks_prefix_match(self):
+        ids = [r["id"] for r in search(self.index, "auth")["results"]]
+        # "auth" is an exact camelCase part of AuthBackend, only a prefix of authenticate.
+        self.assertEqual(ids[:2], ["backends.py:AuthBackend", "backends.py:authenticate"])
+
+    def test_imports_and_paths_are_indexed(self):
+        self.assertEqual(search(self.index, "shortcuts")["results"][0]["id"], "views.py")
+        self.assertEqual(search(self.index, "views")["results"][0]["id"], "views.py")
+
+    def test_no_match(self):
+        self.assertEqual(search(self.index, "kubernetes")["results"], [])
+
+
+class SearchEndpointTests(TestCase):
+    def test_missing_query(self):
+        self.assertEqual(self.client.get("/api/search/").status_code, 400)
+
+    def test_invalid_limit(self):
+        self.assertEqual(self.client.get("/api/search/", {"q": "auth", "limit": "x"}).status_code, 400)
+
+    @mock.patch("api.views.load_search_index", return_value=None)
+    def test_no_index_yet(self, _):
+        self.assertEqual(self.client.get("/api/search/", {"q": "auth"}).status_code, 404)
+
+    def test_search(self):
+        index = build_search_index([{"name": "auth.py", "summary": "Login.", "functions": [], "classes": []}])
+        with mock.patch("api.views.load_search_index", return_value=index):
+            response = self.client.get("/api/search/", {"q": "login"})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()["results"][0]["id"], "auth.py")
+
+
+class GraphLayoutTests(TestCase):
+    def test_grid_repulsion_matches_exact(self):
+        import numpy as np
+
+        rng = np.random.default_rng(0)
+        for pos in (rng.normal(size=(2000, 2)) * 500, rng.uniform(-1000, 1000, size=(2000, 2))):
+            exact = graph_layout._exact_repulsion(pos, graph_layout.CHARGE_STRENGTH)
+            approx = graph_layout._grid_repulsion(pos, graph_layout.CHARGE_STRENGTH)
+            error = np.linalg.norm(exact - approx, axis=1)
+            magnitude = np.linalg.norm(exact, axis=1)
+
+            self.assertLess(np.linalg.norm(exact - approx) / np.linalg.norm(exact), 0.1)
+            self.assertLess(np.percentile(error / magnitude, 99), 0.25)
+            self.assertLess(error.max() / np.sqrt((magnitude ** 2).mean()), 0.3)
+
+    def _star_graph(self, files, symbols_per_file):
+        nodes = [{"id": "repository", "label": "repo"}]
+        links = []
+        for i in range(files):
+            nodes.append({"id": f"f{i}.py", "label": f"f{i}.py"})
+            links.append({"source": "repository", "target": f"f{i}.py"})
+            for j in range(symbols_per_file):
+                nodes.append({"id": f"f{i}:s{j}", "label": f"s{j}"})
+                links.append({"source": f"f{i}.py", "target": f"f{i}:s{j}"})
+        return nodes, links
+
+    def test_compute_layout_writes_finite_coordinates(self):
+        import numpy as np
+
+        # Small graphs use exact repulsion, large ones the grid approximation.
+        for files, iterations in ((5, graph_layout.ITERATIONS), (120, 20)):
+            nodes, links = self._star_graph(files, 10)
+            layout = graph_layout.compute_layout(nodes, links, iterations=iterations)
+
+            xs = np.array([n["x"] for n in nodes])
+            ys = np.array([n["y"] for n in nodes])
+            self.assertTrue(np.isfinite(xs).all() and np.isfinite(ys).all())
+            self.assertEqual(layout["x_min"], xs.min())
+            self.assertEqual(layout["y_max"], ys.max())
+
+    def test_exact_repulsion_only_for_small_graphs(self):
+        for count, expected in ((graph_layout.EXACT_REPULSION_LIMIT, "exact"), (graph_layout.EXACT_REPULSION_LIMIT + 1, "grid")):
+            nodes = [{"id": str(i), "label": str(i)} for i in range(count)]
+            with mock.patch.object(graph_layout, "_exact_repulsion", wraps=graph_layout._exact_repulsion) as exact, \
+                    mock.patch.object(graph_layout, "_grid_repulsion", wraps=graph_layout._grid_repulsion) as grid:
+                graph_layout.compute_layout(nodes, [], iterations=2)
+            self.assertEqual((exact.called, grid.called), (expected == "exact", expected == "grid"))
+        self.assertLessEqual(graph_layout.EXACT_REPULSION_LIMIT, 200)
+
+    def test_compute_layout_empty_graph(self):
+        self.assertEqual(graph_layout.compute_layout([], [])["iterations"], 0)
+
+
+class SummarizerTestCase(TestCase):
+    """Runs in a temporary working directory with a stubbed LLM."""
+
+    files = {"m1.py": "def f1(): pass\n", "m2.py": "def f2(): pass\n", "m3.py": "def f3(): pass\n"}
+
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        cwd = os.getcwd()
+        os.chdir(tmp.name)
+        self.addCleanup(os.chdir, cwd)
+
+        self.repo = os.path.join(tmp.name, "repo")
+        os.makedirs(self.repo)
+        for name, content in self.files.items():
+            with open(os.path.join(self.repo, name), "w", encoding="utf-8") as f:
+                f.write(content)
+        self.parsed = dict(sorted(analyze_code_structure(self.repo).items()))
+
+        self.calls = []
+        self.failing = set()
+        patcher = mock.patch.object(ai_summarizer, "_generate_with_fallback", side_effect=self._generate)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def _generate(self, prompt, context="general"):
+        self.calls.append(context)
+        if context.split(":")[0] in self.failing:
+            return ai_summarizer.SUMMARY_UNAVAILABLE, None
+        return f"About {context}.", object()
+
+    def summarize(self, **kwargs):
+        return ai_summarizer.summarize_repository(self.repo, self.parsed, **kwargs)
+
+
+class CheckpointTests(SummarizerTestCase):
+    def test_round_trip_ignores_truncated_line(self):
+        summary = {"name": "m1.py", "summary": "About m1.", "functions": [], "classes": []}
+        checkpoint.record_file("x", "m1.py", "abc", summary)
+        with open(os.path.join(checkpoint.CHECKPOINT_DIR, "x.jsonl"), "a", encoding="utf-8") as f:
+            f.write('{"name": "m2.py", "ha')
+
+        self.assertEqual(checkpoint.load_checkpoint("x"), {"m1.py": {"name": "m1.py", "hash": "abc", "summary": summary}})
+        checkpoint.clear_checkpoint("x")
+        self.assertEqual(checkpoint.load_checkpoint("x"), {})
+
+    def test_resume_only_redoes_unfinished_files(self):
+        self.failing = {"m2.py"}
+        first = self.summarize(checkpoint_id="x")
+        self.assertFalse(first["complete"])
+        self.assertEqual(first["incomplete_files"], ["m2.py"])
+        self.assertEqual(set(checkpoint.load_checkpoint("x")), {"m1.py", "m3.py"})
+
+        self.failing, self.calls = set(), []
+        second = self.summarize(checkpoint_id="x", resume=True)
+        self.assertEqual(self.calls, ["m2.py", "m2.py:f2", "project_overview"])
+        self.assertTrue(second["complete"])
+        self.assertEqual(checkpoint.load_checkpoint("x"), {})
+
+    def test_changed_file_is_summarized_again(self):
+        self.failing = {"project_overview"}
+        self.summarize(checkpoint_id="x")
+        with open(os.path.join(self.repo, "m1.py"), "a", encoding="utf-8") as f:
+            f.write("def g(): pass\n")
+
+        self.failing, self.calls = set(), []
+        self.summarize(checkpoint_id="x", resume=True)
+        self.assertEqual(self.calls, ["m1.py", "m1.py:f1", "project_overview"])
+
+    def test_analyze_reports_incomplete_run_as_resumable(self):
+        archive = io.BytesIO()
+        with zipfile.ZipFile(archive, "w") as z:
+            z.writestr("m1.py", "def f1(): pass\n")
+        upload = SimpleUploadedFile("repo.zip", archive.getvalue(), content_type="application/zip")
+        partial = {"complete": False, "incomplete_files": ["m1.py"]}
+
+        with mock.patch("api.views.summarize_repository", return_value=partial):
+            response = self.client.post("/api/analyze/", {"file": upload})
+
+        data = response.json()
+        self.assertEqual(response.status_code, 200)
+        self.assertFalse(data["complete"])
+        self.assertTrue(data["resumable"])
+        self.assertEqual(data["checkpoint_id"], checkpoint.checkpoint_id_for(f"zip:{hashlib.sha1(archive.getvalue()).hexdigest()}"))
+
+    def test_zip_checkpoint_is_keyed_by_content(self):
+        ids = []
+        for content in ("def f1(): pass\n", "def f2(): pass\n"):
+            archive = io.BytesIO()
+            with zipfile.ZipFile(archive, "w") as z:
+                z.writestr("m1.py", content)
+            upload = SimpleUploadedFile("project.zip", archive.getvalue(), content_type="application/zip")
+            with mock.patch("api.views.summarize_repository", return_value={"complete": False}):
+                ids.append(self.client.post("/api/analyze/", {"file": upload}).json()["checkpoint_id"])
+        self.assertNotEqual(ids[0], ids[1])
+
+    def test_prune_drops_old_and_excess_checkpoints(self):
+        now = time.time()
+        for i in range(5):
+            checkpoint.record_file(f"c{i}", "m1.py", "abc", {})
+            age = checkpoint.MAX_CHECKPOINT_AGE + 60 if i == 0 else i
+            os.utime(os.path.join(checkpoint.CHECKPOINT_DIR, f"c{i}.jsonl"), (now - age, now - age))
+
+        with mock.patch.object(checkpoint, "MAX_CHECKPOINTS", 3):
+            checkpoint.prune_checkpoints(keep="c4")
+        self.assertEqual(sorted(os.listdir(checkpoint.CHECKPOINT_DIR)), ["c1.jsonl", "c2.jsonl", "c4.jsonl"])
+
+
+class LazySymbolTests(SummarizerTestCase):
+    def test_lazy_run_only_summarizes_files(self):
+        result = self.summarize(lazy_symbols=True)
+        self.assertEqual(self.calls, ["m1.py", "m2.py", "m3.py", "project_overview"])
+        self.assertEqual(result["repository_graph"]["files"][0]["functions"], [{"name": "f1", "summary": None}])
+
+    def test_symbol_summary_is_cached_and_indexed(self):
+        self.summarize(lazy_symbols=True)
+        self.calls = []
+
+        self.assertEqual(ai_summarizer.summarize_symbol_on_demand("m1.py", "f1", "function"), "About m1.py:f1.")
+        self.assertEqual(ai_summarizer.summarize_symbol_on_demand("m1.py", "f1", "function"), "About m1.py:f1.")
+        self.assertEqual(self.calls, ["m1.py:f1"])
+
+        hit = search(load_search_index(), "f1")["results"][0]
+        self.assertEqual((hit["id"], hit["summary"]), ("m1.py:f1", "About m1.py:f1."))
+
+    def test_index_overlay_does_not_rewrite_index_file(self):
+        self.summarize(lazy_symbols=True)
+        self.assertEqual(search(load_search_index(), "about")["total"], 4)
+        mtime = os.path.getmtime("search_index.json")
+
+        ai_summarizer.summarize_symbol_on_demand("m2.py", "f2", "function")
+        self.assertEqual(os.path.getmtime("search_index.json"), mtime)
+        hit = search(load_search_index(), "f2")["results"][0]
+        self.assertEqual((hit["id"], hit["summary"]), ("m2.py:f2", "About m2.py:f2."))
+
+    def test_summary_for_replaced_analysis_is_dropped(self):
+        self.summarize(lazy_symbols=True)
+
+        def generate(context):
+            self.summarize(lazy_symbols=True)
+            return "Stale summary."
+
+        self.assertEqual(symbol_store.get_symbol_summary("m1.py", "function", "f1", generate), "Stale summary.")
+        self.assertEqual(ai_summarizer.summarize_symbol_on_demand("m1.py", "f1", "function"), "About m1.py:f1.")
+        self.assertEqual(search(load_search_index(), "stale")["total"], 0)
+
+    def test_worker_processes_keep_each_others_summaries(self):
+        functions = [f"f{i}" for i in range(40)]
+        symbol_store.save_symbol_context({"a.py": {"content": "", "functions": functions, "classes": []}}, "run")
+        code = (
+            "import sys; from analyzer import symbol_store\n"
+            "for name in sys.argv[1:]:\n"
+            "    symbol_store.get_symbol_summary('a.py', 'function', name, lambda context: name.upper())\n"
+        )
+        env = {**os.environ, "PYTHONPATH": str(settings.BASE_DIR)}
+        workers = [
+            subprocess.Popen([sys.executable, "-c", code, *functions[i::2]], env=env)
+            for i in range(2)
+        ]
+        for worker in workers:
+            self.assertEqual(worker.wait(30), 0)
+
+        rows = symbol_store.summaries_since("run")
+        self.assertEqual(sorted(name for _, _, _, name, _ in rows), sorted(functions))
+
+    def test_unavailable_summary_is_retried(self):
+        self.summarize(lazy_symbols=True)
+        self.failing = {"m1.py"}
+        self.assertEqual(ai_summarizer.summarize_symbol_on_demand("m1.py", "f1", "function"), ai_summarizer.SUMMARY_UNAVAILABLE)
+
+        self.failing = set()
+        self.assertEqual(ai_summarizer.summarize_symbol_on_demand("m1.py", "f1", "function"), "About m1.py:f1.")
+
+    def test_unknown_symbol(self):
+        self.summarize(lazy_symbols=True)
+        self.assertIsNone(ai_summarizer.summarize_symbol_on_demand("m1.py", "nope", "function"))
+        self.assertIsNone(ai_summarizer.summarize_symbol_on_demand("m1.py", "f1", "class"))
+
+    def test_eager_run_resets_symbol_store(self):
+        self.summarize(lazy_symbols=True)
+        self.summarize()
+        self.assertIsNone(ai_summarizer.summarize_symbol_on_demand("m1.py", "f1", "function"))
+
+    def test_concurrent_requests_share_one_generate_call(self):
+        symbol_store.save_symbol_context({"a.py": {"content": "", "functions": ["f"], "classes": []}}, "run")
+        started, release = threading.Event(), threading.Event()
+        generated, results = [], []
+
+        def generate(context):
+            generated.append(context)
+            started.set()
+            release.wait(5)
+            return "Summary of f."
+
+        def request():
+            results.append(symbol_store.get_symbol_summary("a.py", "function", "f", generate))
+
+        threads = [threading.Thread(target=request) for _ in range(2)]
+        threads[0].start()
+        started.wait(5)
+        threads[1].start()
+        threads[1].join(0.2)
+        release.set()
+        for t in threads:
+            t.join(5)
+
+        self.assertEqual(len(generated), 1)
+        self.assertEqual(results, ["Summary of f.", "Summary of f."])
+
+
+class SymbolEndpointTests(SummarizerTestCase):
+    def test_missing_params(self):
+        self.assertEqual(self.client.get("/api/symbol/", {"file": "m1.py"}).status_code, 400)
+
+    def test_invalid_kind(self):
+        response = self.client.get("/api/symbol/", {"file": "m1.py", "name": "f1", "kind": "module"})
+        self.assertEqual(response.status_code, 400)
+
+    def test_unknown_symbol(self):
+        response = self.client.get("/api/symbol/", {"file": "m1.py", "name": "f1"})
+        self.assertEqual(response.status_code, 404)
+
+    def test_summary_and_unavailable(self):
+        self.summarize(lazy_symbols=True)
+        self.failing = {"m1.py"}
+        self.assertEqual(self.client.get("/api/symbol/", {"file": "m1.py", "name": "f1"}).status_code, 503)
+
+        self.failing = set()
+        response = self.client.get("/api/symbol/", {"file": "m1.py", "name": "f1"})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()["summary"], "About m1.py:f1.")
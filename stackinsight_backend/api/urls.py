@@ -1,6 +1,8 @@
 from django.urls import path
-from .views import analyze_github
+from .views import analyze_github, search_repository, symbol_summary
 
 urlpatterns = [
     path('analyze/', analyze_github),
+    path('search/', search_repository),
+    path('symbol/', symbol_summary),
 ]
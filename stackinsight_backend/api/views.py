@@ -1,11 +1,13 @@
 from rest_framework.decorators import api_view, parser_classes
 from rest_framework.response import Response
 from rest_framework.parsers import MultiPartParser, FormParser, JSONParser
-import os, tempfile, zipfile, io, requests, shutil
+import os, tempfile, zipfile, io, requests, shutil, time, hashlib
 
 from analyzer.framework_detector import detect_frameworks, classify_frameworks
 from analyzer.code_parser import analyze_code_structure
-from analyzer.ai_summarizer import summarize_repository
+from analyzer.ai_summarizer import SUMMARY_UNAVAILABLE, summarize_repository, summarize_symbol_on_demand
+from analyzer.checkpoint import checkpoint_id_for
+from analyzer.search_index import load_search_index, search
 
 
 @api_view(['POST'])
@@ -14,12 +16,19 @@ def analyze_github(request):
     """
     Analyze a GitHub repo (by URL) or a ZIP upload.
     Detect frameworks, parse structure, and generate AI summaries with function/class insights.
+    Pass resume=true to continue an interrupted analysis of the same repo / ZIP
+    from its checkpoint instead of starting over, and lazy_symbols=true to skip
+    function/class summaries until they are requested via /api/symbol/.
     """
 
+    started_at = time.perf_counter()
     temp_dir = tempfile.mkdtemp(prefix="stackinsight_")
 
     try:
         extracted = None
+        checkpoint_id = None
+        resume = str(request.data.get("resume", "")).lower() in ("1", "true", "yes")
+        lazy_symbols = str(request.data.get("lazy_symbols", "")).lower() in ("1", "true", "yes")
 
         # --- CASE 1: GitHub Repository URL ---
         repo_url = request.data.get("repo_url", None)
@@ -29,6 +38,7 @@ def analyze_github(request):
                 return Response({"error": "Invalid GitHub URL"}, status=400)
 
             owner, repo = parts[-2], parts[-1]
+            checkpoint_id = checkpoint_id_for(f"github:{owner}/{repo}")
             archive_url = f"https://github.com/{owner}/{repo}/archive/refs/heads/main.zip"
 
             print(f"📦 Fetching repo archive from: {archive_url}")
@@ -62,9 +72,14 @@ def analyze_github(request):
                 return Response({"error": "Only ZIP files are allowed"}, status=400)
 
             zip_path = os.path.join(temp_dir, uploaded_file.name)
+            digest = hashlib.sha1()
             with open(zip_path, "wb") as f:
                 for chunk in uploaded_file.chunks():
                     f.write(chunk)
+                    digest.update(chunk)
+            # Keyed by content, not file name: two different "project.zip"
+            # uploads must not share (or clear) each other's checkpoint.
+            checkpoint_id = checkpoint_id_for(f"zip:{digest.hexdigest()}")
 
             with zipfile.ZipFile(zip_path, "r") as z:
                 z.extractall(temp_dir)
@@ -89,10 +104,15 @@ def analyze_github(request):
                 parsed_structure,
                 frontend_framework=classification.get("frontend_framework"),
                 backend_framework=classification.get("backend_framework"),
-                frameworks=frameworks
+                frameworks=frameworks,
+                checkpoint_id=checkpoint_id,
+                resume=resume,
+                lazy_symbols=lazy_symbols
             )
         except Exception as e:
-            repo_summary = {"error": f"AI summarization failed: {str(e)}"}
+            # Files finished before the failure are kept in the checkpoint,
+            # so the client can retry with resume=true.
+            repo_summary = {"error": f"AI summarization failed: {str(e)}", "complete": False}
 
         # --- BUILD FINAL RESPONSE ---
         result = {
@@ -103,13 +123,69 @@ def analyze_github(request):
             "project_summary": repo_summary.get("project_summary", "Summary unavailable."),
             "repository_graph": repo_summary.get("repository_graph", {}),
             "nodes": repo_summary.get("nodes", []),
-            "links": repo_summary.get("links", [])
+            "links": repo_summary.get("links", []),
+            "layout": repo_summary.get("layout", {}),
+            "lazy_symbols": repo_summary.get("lazy_symbols", False),
+            # Quota exhaustion does not raise, so an incomplete run is reported here.
+            "complete": repo_summary.get("complete", False),
+            "incomplete_files": repo_summary.get("incomplete_files", []),
+            "checkpoint_id": checkpoint_id,
+            "resumable": bool(checkpoint_id) and not repo_summary.get("complete", False)
         }
+        if "error" in repo_summary:
+            result["error"] = repo_summary["error"]
 
         # --- CLEANUP ---
         shutil.rmtree(temp_dir, ignore_errors=True)
+        print(f"⏱️ Analysis request finished in {time.perf_counter() - started_at:.2f} s")
         return Response(result, status=200)
 
     except Exception as e:
         shutil.rmtree(temp_dir, ignore_errors=True)
         return Response({"error": str(e)}, status=500)
+
+
+@api_view(['GET'])
+def search_repository(request):
+    """
+    Full-text search over the last analyzed repository's files, symbols,
+    imports and summaries. Served from the local index, no LLM calls.
+    """
+    query = request.query_params.get("q", "").strip()
+    if not query:
+        return Response({"error": "Provide a search query with ?q="}, status=400)
+
+    try:
+        limit = max(1, min(int(request.query_params.get("limit", 20)), 100))
+    except ValueError:
+        return Response({"error": "limit must be an integer"}, status=400)
+
+    index = load_search_index()
+    if index is None:
+        return Response({"error": "No search index yet. Analyze a repository first."}, status=404)
+
+    return Response(search(index, query, limit=limit), status=200)
+
+
+@api_view(['GET'])
+def symbol_summary(request):
+    """
+    Summarize a function or class from the last lazy analysis on first request.
+    Results are cached, and concurrent requests for the same symbol share one LLM call.
+    """
+    filename = request.query_params.get("file", "").strip()
+    name = request.query_params.get("name", "").strip()
+    kind = request.query_params.get("kind", "function").strip()
+    if not filename or not name:
+        return Response({"error": "Provide file and name query parameters."}, status=400)
+    if kind not in ("function", "class"):
+        return Response({"error": "kind must be 'function' or 'class'"}, status=400)
+
+    summary = summarize_symbol_on_demand(filename, name, kind)
+    if summary is None:
+        return Response({"error": f"Unknown {kind} {name} in {filename}."}, status=404)
+    if summary == SUMMARY_UNAVAILABLE:
+        # Not cached server-side, so the client may retry later.
+        return Response({"error": "Summary unavailable, try again later."}, status=503)
+
+    return Response({"file": filename, "name": name, "kind": kind, "summary": summary}, status=200)
@@ -25,6 +25,7 @@ export default function AnalyzerPage() {
     try {
       const response = await axios.post("http://127.0.0.1:8000/api/analyze/", {
         repo_url: repoUrl,
+        lazy_symbols: true,
       });
 
       setLogs((prev) => [...prev, "✅ Analysis complete!"]);
@@ -36,6 +37,25 @@ export default function AnalyzerPage() {
     }
   };
 
+  // Function / class summaries are generated on first click in lazy mode.
+  // Only successful summaries are kept on the node; failures are shown but
+  // not stored, so the next click retries.
+  const loadSymbolSummary = async (d) => {
+    let summary;
+    try {
+      const response = await axios.get("http://127.0.0.1:8000/api/symbol/", {
+        params: { file: d.file, name: d.label, kind: d.kind },
+      });
+      d.summary = response.data.summary;
+      summary = d.summary;
+    } catch (err) {
+      summary = `Summary unavailable: ${err.response?.data?.error || err.message}`;
+    }
+    setSelectedNode((prev) =>
+      prev && prev.label === d.label ? { ...prev, summary } : prev
+    );
+  };
+
   useEffect(() => {
     if (result && result.nodes && result.links) {
       renderGraph(result);
@@ -63,18 +83,59 @@ export default function AnalyzerPage() {
       .style("pointer-events", "none")
       .style("position", "absolute");
 
-    const simulation = d3
-      .forceSimulation(data.nodes)
-      .force("link", d3.forceLink(data.links).id((d) => d.id).distance(120))
-      .force("charge", d3.forceManyBody().strength(-350))
-      .force("center", d3.forceCenter(width / 2, height / 2));
+    // Everything is drawn inside one group so the graph can be zoomed and panned.
+    const viewport = svg.append("g");
+    const zoom = d3
+      .zoom()
+      .scaleExtent([0.05, 4])
+      .on("zoom", (event) => viewport.attr("transform", event.transform));
+    svg.call(zoom);
+
+    // Node coordinates are precomputed by the backend; only fall back to a
+    // client-side simulation for results that were cached without a layout.
+    const hasLayout =
+      data.layout &&
+      data.nodes.every((d) => d.x !== undefined && d.y !== undefined);
+
+    let simulation = null;
+    let links = data.links;
 
-    const link = svg
+    if (hasLayout) {
+      const nodeById = new Map(data.nodes.map((d) => [d.id, d]));
+      const resolve = (end) =>
+        typeof end === "object" ? end : nodeById.get(end);
+      links = data.links
+        .map((l) => ({ ...l, source: resolve(l.source), target: resolve(l.target) }))
+        .filter((l) => l.source && l.target);
+
+      const { x_min, x_max, y_min, y_max } = data.layout;
+      const padding = 40;
+      const scale = Math.min(
+        1,
+        width / (x_max - x_min + padding * 2),
+        height / (y_max - y_min + padding * 2)
+      );
+      svg.call(
+        zoom.transform,
+        d3.zoomIdentity
+          .translate(width / 2, height / 2)
+          .scale(scale)
+          .translate(-(x_min + x_max) / 2, -(y_min + y_max) / 2)
+      );
+    } else {
+      simulation = d3
+        .forceSimulation(data.nodes)
+        .force("link", d3.forceLink(data.links).id((d) => d.id).distance(120))
+        .force("charge", d3.forceManyBody().strength(-350))
+        .force("center", d3.forceCenter(width / 2, height / 2));
+    }
+
+    const link = viewport
       .append("g")
       .attr("stroke", "#666")
       .attr("stroke-opacity", 0.6)
       .selectAll("line")
-      .data(data.links)
+      .data(links)
       .enter()
       .append("line")
       .attr("stroke-width", 1.5);
@@ -105,7 +166,7 @@ export default function AnalyzerPage() {
       return "⚙️ Function / Class";
     };
 
-    const node = svg
+    const node = viewport
       .append("g")
       .selectAll("circle")
       .data(data.nodes)
@@ -140,11 +201,15 @@ export default function AnalyzerPage() {
         tooltip.transition().duration(300).style("opacity", 0);
       })
       .on("click", (event, d) => {
+        const pending = data.lazy_symbols && d.kind && !d.summary;
         setSelectedNode({
           label: d.label,
           type: getNodeType(d.label),
-          summary: d.summary || "No detailed summary available.",
+          summary: pending
+            ? "⏳ Generating summary..."
+            : d.summary || "No detailed summary available.",
         });
+        if (pending) loadSymbolSummary(d);
       })
       .call(
         d3
@@ -154,7 +219,7 @@ export default function AnalyzerPage() {
           .on("end", dragended)
       );
 
-    const label = svg
+    const label = viewport
       .append("g")
       .selectAll("text")
       .data(data.nodes)
@@ -166,7 +231,7 @@ export default function AnalyzerPage() {
       .attr("x", 10)
       .attr("y", 3);
 
-    simulation.on("tick", () => {
+    const draw = () => {
       link
         .attr("x1", (d) => d.source.x)
         .attr("y1", (d) => d.source.y)
@@ -174,20 +239,34 @@ export default function AnalyzerPage() {
         .attr("y2", (d) => d.target.y);
       node.attr("cx", (d) => d.x).attr("cy", (d) => d.y);
       label.attr("x", (d) => d.x + 10).attr("y", (d) => d.y + 3);
-    });
+    };
+
+    if (simulation) {
+      simulation.on("tick", draw);
+    } else {
+      draw();
+    }
 
     function dragstarted(event, d) {
+      if (!simulation) return;
       if (!event.active) simulation.alphaTarget(0.3).restart();
       d.fx = d.x;
       d.fy = d.y;
     }
 
     function dragged(event, d) {
+      if (!simulation) {
+        d.x = event.x;
+        d.y = event.y;
+        draw();
+        return;
+      }
       d.fx = event.x;
       d.fy = event.y;
     }
 
     function dragended(event, d) {
+      if (!simulation) return;
       if (!event.active) simulation.alphaTarget(0);
       d.fx = null;
       d.fy = null;